@@ -8,6 +8,17 @@ import os
 # Add this at the module level, before the functions
 _category_cache = {}
 
+# Number of parsed rows held in memory before flushing them to the database
+BATCH_SIZE = 5000
+
+# Column-parallel arrays are unnested server-side into rows; air_date,
+# original_value, original_round and notes are always NULL for Anki data
+INSERT_QUESTIONS_SQL = """
+    INSERT INTO trivia_questions 
+    (question, answer, category_id, difficulty)
+    SELECT * FROM unnest(%s::text[], %s::text[], %s::int[], %s::text[])
+"""
+
 def clean_text(text):
     # Remove quotes if they wrap the entire text
     if text.startswith('"') and text.endswith('"'):
@@ -25,8 +36,8 @@ def get_or_create_category(cursor, category_name):
     
     # Look up category (case insensitive)
     cursor.execute(
-        "SELECT id FROM categories WHERE LOWER(name) = LOWER(%s)",
-        (category_name,)
+        "SELECT id FROM categories WHERE LOWER(name) = %s",
+        (cache_key,)
     )
     result = cursor.fetchone()
     
@@ -46,60 +57,105 @@ def get_or_create_category(cursor, category_name):
     _category_cache[cache_key] = category_id
     return category_id
 
-def import_anki_data(tsv_file, db_params):
-    # Database connection
-    conn = psycopg2.connect(**db_params)
-    cursor = conn.cursor()
+def preload_categories(cursor, category_names):
+    # Keep the first spelling seen for each case-insensitive name
+    names_by_key = {}
+    for category_name in category_names:
+        cache_key = category_name.lower()
+        if cache_key not in _category_cache:
+            names_by_key.setdefault(cache_key, category_name)
+    
+    if not names_by_key:
+        return
     
-    questions_to_insert = []
+    # Look up all existing categories in a single query (case insensitive)
+    cursor.execute(
+        "SELECT id, LOWER(name) FROM categories WHERE LOWER(name) = ANY(%s)",
+        (list(names_by_key),)
+    )
+    for category_id, cache_key in cursor.fetchall():
+        _category_cache[cache_key] = category_id
+        names_by_key.pop(cache_key, None)
     
+    if not names_by_key:
+        return
+    
+    # Create the missing categories in one batch
+    created = execute_values(
+        cursor,
+        "INSERT INTO categories (name) VALUES %s ON CONFLICT (name) DO NOTHING RETURNING id, name",
+        [(name,) for name in names_by_key.values()],
+        fetch=True
+    )
+    for category_id, name in created:
+        _category_cache[name.lower()] = category_id
+
+def read_anki_rows(tsv_file):
     with open(tsv_file, 'r', encoding='utf-8') as f:
         # Skip metadata lines that start with #
         for line in f:
             if not line.startswith('#'):
                 break
         
-        # Create CSV reader with tab delimiter
-        reader = csv.reader(f, delimiter='\t')
-        
-        for row in reader:
+        for line in f:
+            if '"' in line:
+                # Quoted fields need the csv module's unescaping
+                row = next(csv.reader((line,), delimiter='\t'))
+            else:
+                # Plain tab-separated line: str.split is much cheaper than csv.reader
+                row = line.rstrip('\r\n').split('\t')
+            
             if len(row) < 7:  # Ensure we have all needed columns
                 continue
-                
-            _, _, _, question, answer, category, _ = row
-            
-            # Clean the text fields
-            question = clean_text(question)
-            answer = clean_text(answer)
-            
-            # Get or create category
-            category_id = get_or_create_category(cursor, category)
-            
-            # Prepare question data
-            # Using 'medium' as default difficulty since Anki format doesn't specify difficulty
-            question_data = (
-                question,
-                answer,
-                category_id,
-                'medium',  # default difficulty
-                None,      # air_date
-                None,      # original_value
-                None,      # original_round
-                None      # notes
-            )
-            
-            questions_to_insert.append(question_data)
+            yield row
+
+def insert_questions(cursor, rows):
+    # Transpose the row tuples into one list per column
+    questions, answers, category_ids, difficulties = (list(column) for column in zip(*rows))
+    cursor.execute(INSERT_QUESTIONS_SQL, (questions, answers, category_ids, difficulties))
+
+def import_anki_data(tsv_file, db_params):
+    # Database connection
+    conn = psycopg2.connect(**db_params)
+    cursor = conn.cursor()
     
-    # Bulk insert questions
-    execute_values(
-        cursor,
-        """
-        INSERT INTO trivia_questions 
-        (question, answer, category_id, difficulty, air_date, original_value, original_round, notes)
-        VALUES %s
-        """,
-        questions_to_insert
-    )
+    # Make case-insensitive category lookups an index seek
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_categories_lower_name ON categories (LOWER(name))")
+    
+    # First pass: resolve every category up front so the insert pass never hits the DB
+    preload_categories(cursor, {row[5] for row in read_anki_rows(tsv_file)})
+    
+    batch = []
+    
+    # Second pass: build the question rows, flushing every BATCH_SIZE rows
+    for row in read_anki_rows(tsv_file):
+        _, _, _, question, answer, category, _ = row
+        
+        # Clean the text fields
+        question = clean_text(question)
+        answer = clean_text(answer)
+        
+        # Get category (served from the cache warmed by preload_categories)
+        category_id = get_or_create_category(cursor, category)
+        
+        # Prepare question data
+        # Using 'medium' as default difficulty since Anki format doesn't specify difficulty
+        question_data = (
+            question,
+            answer,
+            category_id,
+            'medium'  # default difficulty
+        )
+        
+        batch.append(question_data)
+        if len(batch) >= BATCH_SIZE:
+            insert_questions(cursor, batch)
+            conn.commit()
+            batch.clear()
+    
+    # Insert whatever is left over
+    if batch:
+        insert_questions(cursor, batch)
     
     # Commit and close
     conn.commit()
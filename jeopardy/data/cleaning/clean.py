@@ -1,31 +1,42 @@
-import pandas as pd
-import unicodedata
+import pyarrow as pa
+from pyarrow import csv as pacsv
+import re
 
 # Load the TSV file
 input_file = '../seasons/season1.tsv'
 output_file = './cleaned.tsv'
 # Read the TSV file
 try:
-    df = pd.read_csv(input_file, sep='\t', encoding='latin-1', on_bad_lines='skip')
+    # pyarrow's multithreaded block reader is much faster than the pandas C engine
+    table = pacsv.read_csv(
+        input_file,
+        read_options=pacsv.ReadOptions(encoding='latin-1', block_size=16 << 20),
+        parse_options=pacsv.ParseOptions(delimiter='\t', invalid_row_handler=lambda row: 'skip'),
+        # pyarrow would infer air_date as date32; keep it text like the other string columns
+        convert_options=pacsv.ConvertOptions(column_types={'air_date': pa.string()})
+    )
+    df = table.to_pandas()
     # Alternative approach if latin-1 doesn't work:
     # df = pd.read_csv(input_file, sep='\t', encoding='utf-8', encoding_errors='replace', on_bad_lines='skip')
 except Exception as e:
     print(f"Error reading the file: {e}")
 
+# Control characters and non-printable characters
+CONTROL_CHARS = re.compile(r'[\x00-\x1f]')
+
 # More thorough cleaning of problematic characters
-def clean_text(text):
-    if not isinstance(text, str):
-        return text
+def clean_column(column):
+    column = column.astype('string')
     # Remove control characters and non-printable characters
-    text = ''.join(char for char in text if ord(char) >= 32)
+    column = column.str.replace(CONTROL_CHARS, '', regex=True)
     # Normalize unicode characters
-    text = unicodedata.normalize('NFKD', text)
+    column = column.str.normalize('NFKD')
     # Remove any remaining non-ASCII characters
-    text = text.encode('ascii', 'ignore').decode('ascii')
-    return text
+    return column.str.encode('ascii', 'ignore').str.decode('ascii')
 
-# Apply the cleaning function to all string columns
-df = df.applymap(clean_text)
+# Apply the cleaning to all string columns
+for col in df.select_dtypes(include='object').columns:
+    df[col] = clean_column(df[col])
 
 # Write the cleaned DataFrame back to a new TSV file
 df.to_csv(output_file, sep='\t', index=False, encoding='utf-8')
@@ -1,5 +1,6 @@
-import json
+import ijson
 import psycopg2
+from psycopg2.extras import execute_values
 from typing import Dict
 import os
 from dotenv import load_dotenv
@@ -33,25 +34,32 @@ def process_mappings(cursor, json_file: str):
     # Dictionary to store category name -> new ID mapping
     category_dict = {}
     
-    # Process JSONL file
-    with open(json_file, "r", encoding="utf-8") as f:
-        data = json.loads(f.read())  # Parse each JSON object per line
-        mappings = data["mappings"]
+    # old_id -> new_id, applied in a single UPDATE (later mappings win, as before)
+    new_ids = {}
 
-    for mapping in mappings:
-        old_id = mapping["id"]
-        new_category_name = mapping["category"]
+    # Stream the "mappings" array instead of loading the whole document
+    with open(json_file, "rb") as f:
+        for mapping in ijson.items(f, "mappings.item"):
+            old_id = mapping["id"]
+            new_category_name = mapping["category"]
 
-        if old_id is not None and new_category_name is not None:
-            # Get or create the new category ID
-            new_category_id = get_or_create_category(cursor, new_category_name, category_dict)
-            
-            # Update all trivia questions with this old_category_id
-            cursor.execute("""
-                UPDATE trivia_questions 
-                SET category_id = %s 
-                WHERE old_category_id = %s
-            """, (new_category_id, old_id))
+            if old_id is not None and new_category_name is not None:
+                # Get or create the new category ID
+                new_category_id = get_or_create_category(cursor, new_category_name, category_dict)
+                new_ids[old_id] = new_category_id
+
+    if not new_ids:
+        return
+
+    # Load the mapping into a temp table and update all trivia questions with one join
+    cursor.execute("CREATE TEMP TABLE category_mappings (old_id INTEGER, new_id INTEGER) ON COMMIT DROP")
+    execute_values(cursor, "INSERT INTO category_mappings (old_id, new_id) VALUES %s", list(new_ids.items()), page_size=1000)
+    cursor.execute("""
+        UPDATE trivia_questions q
+        SET category_id = m.new_id
+        FROM category_mappings m
+        WHERE q.old_category_id = m.old_id
+    """)
 
 def main():
     load_dotenv(os.path.join(os.path.dirname(__file__), '..', '.env'))
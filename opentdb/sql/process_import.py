@@ -1,6 +1,7 @@
 import json
 import html
 import psycopg2
+from psycopg2.extras import execute_values
 from typing import List, Dict
 
 def clean_string(text: str) -> str:
@@ -39,34 +40,39 @@ def insert_into_postgres(questions: List[Dict], db_config: Dict):
     conn = psycopg2.connect(**db_config)
     cur = conn.cursor()
     
-    for q in questions:
-        # Insert category if not exists
-        cur.execute("""
+    # Insert all distinct categories and resolve their ids in one round trip;
+    # new rows come back from RETURNING, existing ones from the table snapshot
+    category_names = list({q['category'] for q in questions})
+    cur.execute("""
+        WITH names AS (
+            SELECT unnest(%s::text[]) AS name
+        ), inserted AS (
             INSERT INTO opentdb_categories (name)
-            VALUES (%s)
+            SELECT name FROM names
             ON CONFLICT (name) DO NOTHING
-            RETURNING id;
-        """, (q['category'],))
-        
-        # Get category_id
-        cur.execute("SELECT id FROM opentdb_categories WHERE name = %s", (q['category'],))
-        category_id = cur.fetchone()[0]
-        
-        # Insert question
-        cur.execute("""
-            INSERT INTO opentdb_import (
-                type, difficulty, category_id, question_text,
-                correct_answer, incorrect_answers
-            )
-            VALUES (%s, %s, %s, %s, %s, %s)
-        """, (
-            q['type'],
-            q['difficulty'],
-            category_id,
-            q['question'],
-            q['correct_answer'],
-            q['incorrect_answers']
-        ))
+            RETURNING id, name
+        )
+        SELECT id, name FROM inserted
+        UNION ALL
+        SELECT c.id, c.name FROM opentdb_categories c JOIN names USING (name)
+    """, (category_names,))
+    category_ids = {name: category_id for category_id, name in cur.fetchall()}
+    
+    # Insert questions in batches
+    execute_values(cur, """
+        INSERT INTO opentdb_import (
+            type, difficulty, category_id, question_text,
+            correct_answer, incorrect_answers
+        )
+        VALUES %s
+    """, [(
+        q['type'],
+        q['difficulty'],
+        category_ids[q['category']],
+        q['question'],
+        q['correct_answer'],
+        q['incorrect_answers']
+    ) for q in questions], page_size=1000)
     
     conn.commit()
     cur.close()
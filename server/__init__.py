@@ -1,14 +1,25 @@
+import os
 from flask import Flask
-from flask_cors import CORS
 from .database import init_db, db
+from .utils.json_provider import OrjsonProvider
 
 # Create the Flask app
 app = Flask(__name__)
-CORS(app)  # Enable CORS for all routes
+app.json = OrjsonProvider(app)  # Faster serialization; emits datetimes as ISO 8601
 
-# Initialize the database
+# Initialize the database (this also loads the .env file)
 init_db(app)
 
+# Enable CORS for all routes unless turned off, e.g. when served same-origin
+# behind a proxy; flask_cors is only imported when it is actually used
+if os.getenv('ENABLE_CORS', '1') != '0':
+    from flask_cors import CORS
+    CORS(app)
+
+# Authenticate requests to views marked with @require_auth
+from .utils.auth import init_auth
+init_auth(app)
+
 # Import and initialize routes
 from .routes import init_routes
 init_routes(app)
@@ -1,25 +1,44 @@
 import os
+from functools import lru_cache
 from flask_sqlalchemy import SQLAlchemy
-from dotenv import load_dotenv
+from sqlalchemy.engine import URL
 
-# Initialize SQLAlchemy instance
-db = SQLAlchemy()
+# Initialize SQLAlchemy instance; objects keep their loaded values after
+# commit instead of being re-SELECTed on the next attribute access
+db = SQLAlchemy(session_options={'expire_on_commit': False})
 
-def init_db(app):
+@lru_cache(maxsize=1)
+def _database_url():
+    """Resolve the database URL from the environment once per process."""
     # --- Load Environment Variables ---
+    from dotenv import load_dotenv  # Only needed this once, so imported lazily
     env_file = os.getenv('ENV_FILE', '.env.local')
     load_dotenv(os.path.join(os.path.dirname(__file__), env_file))
 
-    # Database Configuration using environment variables
-    DB_NAME = os.getenv('POSTGRES_DB')
-    DB_USER = os.getenv('POSTGRES_USER')
-    DB_PASSWORD = os.getenv('POSTGRES_PASSWORD')
-    DB_HOST = os.getenv('POSTGRES_DB_HOST')
-    DB_PORT = os.getenv('POSTGRES_DB_PORT', '5432')  # Default PostgreSQL port
+    # Database Configuration using environment variables - Use the psycopg 3 driver,
+    # which also prepares statements server-side once they have been run a few times
+    return URL.create(
+        'postgresql+psycopg',
+        username=os.getenv('POSTGRES_USER'),
+        password=os.getenv('POSTGRES_PASSWORD'),
+        host=os.getenv('POSTGRES_DB_HOST'),
+        port=int(os.getenv('POSTGRES_DB_PORT', '5432')),  # Default PostgreSQL port
+        database=os.getenv('POSTGRES_DB'),
+    )
 
-    # Configure SQLAlchemy - Use 'postgresql+psycopg2' driver
-    app.config['SQLALCHEMY_DATABASE_URI'] = f'postgresql+psycopg2://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}'
+def init_db(app):
+    # Configure SQLAlchemy
+    app.config['SQLALCHEMY_DATABASE_URI'] = _database_url()
     app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False  # Disable modification tracking overhead
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+        'pool_pre_ping': False,  # Skip the extra round trip per checkout; pool_recycle retires old connections
+        'pool_use_lifo': True,   # Reuse the most recently returned connection so idle extras can time out
+        'pool_size': 20,         # Persistent connections kept open between requests
+        'max_overflow': 20,      # Extra connections allowed under burst load
+        'pool_recycle': 1800,    # Recycle connections every 30 minutes
+        'query_cache_size': 1200,  # Room for every compiled route query in the statement cache
+        'connect_args': {'options': '-c statement_timeout=5000'}  # Fail runaway queries after 5s
+    }
 
     # Initialize the app with the database
     db.init_app(app) 
\ No newline at end of file
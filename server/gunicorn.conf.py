@@ -0,0 +1,21 @@
+# Gunicorn settings for the backend container (picked up automatically from the working directory).
+# The container serves `app:app`: /app is imported as the package `app` with PYTHONPATH=/,
+# since the server code relies on package-relative imports.
+import multiprocessing
+import os
+
+bind = '0.0.0.0:5000'
+
+# Threaded workers overlap requests waiting on the database. Workers default to
+# one per core, capped at 4 so workers * threads (at most one connection each)
+# stays inside Postgres' default max_connections of 100.
+worker_class = 'gthread'
+workers = int(os.getenv('WEB_CONCURRENCY', min(multiprocessing.cpu_count(), 4)))
+threads = 16
+
+# Reuse client connections for a few seconds instead of closing after each response
+keepalive = 5
+
+# Import the app once in the master and fork workers from it. Safe because the
+# app opens no database connections at import; each worker's pool fills lazily.
+preload_app = True
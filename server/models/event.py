@@ -16,4 +16,11 @@ class Event(db.Model):
 
     # Relationships
     creator: Mapped["User"] = relationship("User", back_populates="events_created", foreign_keys=[user_id])
-    rounds: Mapped[List["Round"]] = relationship("Round", back_populates="event", cascade="all, delete-orphan", order_by="Round.round_number") 
\ No newline at end of file
+    rounds: Mapped[List["Round"]] = relationship("Round", back_populates="event", cascade="all, delete-orphan", order_by="Round.round_number")
+    # Read-only view of rounds that haven't been soft deleted
+    active_rounds: Mapped[List["Round"]] = relationship(
+        "Round",
+        primaryjoin="and_(Event.id == Round.event_id, Round.is_deleted == False)",
+        order_by="Round.round_number",
+        viewonly=True
+    ) 
\ No newline at end of file
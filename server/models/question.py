@@ -1,5 +1,6 @@
 from datetime import datetime
 from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import Index
 from typing import List, Optional
 from ..database import db
 
@@ -14,6 +15,14 @@ class TriviaQuestion(db.Model):
     original_value: Mapped[Optional[int]] = mapped_column(db.SmallInteger, nullable=True)
     original_round: Mapped[Optional[int]] = mapped_column(db.SmallInteger, nullable=True)
     notes: Mapped[Optional[str]] = mapped_column(db.Text, nullable=True)
+    rand_key: Mapped[float] = mapped_column(db.Float, nullable=False, server_default=db.func.random())  # Uniform [0, 1) sort key for random sampling
+
+    __table_args__ = (
+        Index('idx_trivia_questions_rand_key', 'rand_key'),
+        Index('idx_trivia_questions_difficulty_rand_key', 'difficulty', 'rand_key'),
+        Index('idx_trivia_questions_category_rand_key', 'category_id', 'rand_key'),
+        Index('idx_trivia_questions_category_difficulty_rand_key', 'category_id', 'difficulty', 'rand_key'),
+    )
 
     # Relationships
     category: Mapped["Category"] = relationship("Category", back_populates="trivia_questions")
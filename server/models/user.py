@@ -1,10 +1,25 @@
 import bcrypt
+import hashlib
+import hmac
+import secrets
 from datetime import datetime, timezone
+from threading import Lock
+from cachetools import LRUCache
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import func
+from sqlalchemy import func, Index
 from typing import List, Optional
 from ..database import db
 
+# Successful bcrypt verifications, keyed by (password_hash, HMAC of the attempt).
+# The HMAC key is random per process so raw passwords are never kept in memory.
+# Failed attempts are never cached, so brute forcing still pays the full bcrypt cost.
+_VERIFY_KEY = secrets.token_bytes(32)
+_verified = LRUCache(maxsize=4096)
+_verified_lock = Lock()
+
+def _attempt_digest(password):
+    return hmac.new(_VERIFY_KEY, password.encode('utf-8'), hashlib.sha256).digest()
+
 class User(db.Model):
     __tablename__ = 'users'
     id: Mapped[int] = mapped_column(primary_key=True)
@@ -23,15 +38,26 @@ class User(db.Model):
         self.password_hash = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
 
     def check_password(self, password):
-        return bcrypt.checkpw(password.encode('utf-8'), self.password_hash.encode('utf-8'))
+        cache_key = (self.password_hash, _attempt_digest(password))
+        with _verified_lock:
+            if _verified.get(cache_key):
+                return True
+        if not bcrypt.checkpw(password.encode('utf-8'), self.password_hash.encode('utf-8')):
+            return False
+        with _verified_lock:
+            _verified[cache_key] = True
+        return True
 
 class UserSession(db.Model):
     __tablename__ = 'user_sessions'
     id: Mapped[int] = mapped_column(primary_key=True)
     user_id: Mapped[int] = mapped_column(db.ForeignKey('users.id', ondelete='CASCADE'), index=True)
-    session_token: Mapped[str] = mapped_column(db.String(255), unique=True, nullable=False, index=True)
+    session_token: Mapped[str] = mapped_column(db.String(255), unique=True, nullable=False)
     created_at: Mapped[datetime] = mapped_column(db.DateTime(timezone=True), server_default=func.now())
     expires_at: Mapped[datetime] = mapped_column(db.DateTime(timezone=True), nullable=False)
 
+    # Equality-only lookups on every authenticated request; hash beats the B-tree here
+    __table_args__ = (Index('idx_user_sessions_token', 'session_token', postgresql_using='hash'),)
+
     # Relationships
     user: Mapped["User"] = relationship(back_populates="sessions") 
\ No newline at end of file
@@ -1,61 +1,95 @@
+import hashlib
+import random
+from threading import Lock
+from cachetools import TTLCache, cached
 from ...database import db
+from ...utils.sampling import sample_questions
+from ...utils.projections import json_object, json_array
 from ...models import Category, TriviaQuestion
-from sqlalchemy import select, func
+from sqlalchemy import select, func, cast, Text, bindparam
 from flask import jsonify, request, Blueprint
+from ... import app
 
 category_bp = Blueprint('category', __name__)
 
+# Category lists change rarely (only via offline imports) but are fetched on
+# every page load, so keep the serialized responses (with their ETags) in memory
+# for a few minutes; browsers may reuse them for as long as the server does.
+_CATEGORY_TTL = 300
+_category_cache = TTLCache(maxsize=32, ttl=_CATEGORY_TTL)
+_category_cache_lock = Lock()
+
+def _with_etag(body):
+    """Pair a response body with a content hash to use as its ETag."""
+    return body, hashlib.blake2b(body.encode(), digest_size=8).hexdigest()
+
+def _cacheable_response(body, etag):
+    """JSON response clients may cache, answered with 304 if their copy is current."""
+    response = app.response_class(body, mimetype='application/json')
+    response.set_etag(etag)
+    response.cache_control.public = True
+    response.cache_control.max_age = _CATEGORY_TTL
+    # Past max-age, serve the stale copy while revalidating with the ETag in the background
+    response.cache_control['stale-while-revalidate'] = str(_CATEGORY_TTL)
+    return response.make_conditional(request)
+
+# PostgreSQL builds the JSON array, so a cache miss is one query and no Python serialization
+_CATEGORIES_JSON = select(cast(json_array(json_object(Category.id, Category.name), Category.name), Text))
+
+@cached(_category_cache, key=lambda: ('all',), lock=_category_cache_lock)
+def _load_categories():
+    return _with_etag(db.session.scalar(_CATEGORIES_JSON))
+
+@cached(_category_cache, key=lambda min_questions: ('active', min_questions), lock=_category_cache_lock)
+def _load_active_categories(min_questions):
+    # Count per category_id first (answerable from the category_id index alone),
+    # then join the few resulting rows to categories
+    counts = (
+        select(TriviaQuestion.category_id, func.count().label('question_count'))
+        .group_by(TriviaQuestion.category_id)
+        .subquery()
+    )
+    question_count = func.coalesce(counts.c.question_count, 0)
+    active = (
+        select(Category.id, Category.name, question_count.label('questionCount')) # Renamed question_count
+        .outerjoin(counts, Category.id == counts.c.category_id) # Use outerjoin
+        .where(question_count >= min_questions)
+        .subquery()
+    )
+    stmt = select(cast(json_array(json_object(*active.c), active.c.name), Text))
+    return _with_etag(db.session.scalar(stmt))
+
+# Questions of one category with the category name, sampled by sample_questions()
+_CATEGORY_QUESTIONS = (
+    select(TriviaQuestion, Category.name)
+    .join(Category, TriviaQuestion.category_id == Category.id)
+    .where(Category.id == bindparam('category_id'))
+)
+
 @category_bp.route('/categories', methods=['GET'])
 def get_categories():
     """Get all available trivia categories."""
-    categories = db.session.scalars(
-        select(Category).order_by(Category.name)
-    ).all()
-
-    # Construct response with camelCase keys (no change needed as keys were simple)
-    return jsonify([{"id": c.id, "name": c.name} for c in categories])
+    return _cacheable_response(*_load_categories())
 
 @category_bp.route('/categories/active', methods=['GET'])
 def get_active_categories():
     """Get categories that have a minimum number of questions."""
     min_questions = request.args.get('min_questions', default=80, type=int)
-
-    stmt = (
-        select(Category.id, Category.name, func.count(TriviaQuestion.id).label('question_count'))
-        .outerjoin(TriviaQuestion, Category.id == TriviaQuestion.category_id) # Use outerjoin
-        .group_by(Category.id, Category.name)
-        .having(func.count(TriviaQuestion.id) >= min_questions)
-        .order_by(Category.name)
-    )
-    results = db.session.execute(stmt).all() # Returns Row objects
-
-    # Manually create dicts with camelCase keys
-    categories_data = [
-        {"id": row.id, "name": row.name, "questionCount": row.question_count} # Renamed question_count
-        for row in results
-    ]
-    return jsonify(categories_data) # Return the transformed data
+    return _cacheable_response(*_load_active_categories(min_questions))
 
 @category_bp.route('/category/<int:category_id>/questions', methods=['GET'])
 def get_category_questions(category_id):
     """Get multiple random questions from a specific category."""
     count = min(request.args.get('count', default=10, type=int), 50) # Cap at 50
 
-    # Verify category exists first
-    category = db.session.get(Category, category_id)
-    if not category:
-        return jsonify({"error": "Category not found"}), 404
-
-    # Fetch random questions
-    stmt = (
-        select(TriviaQuestion)
-        .filter_by(category_id=category_id)
-        .order_by(func.random())
-        .limit(count)
-    )
-    questions = db.session.scalars(stmt).all()
+    # Fetch random questions together with the category name in one query
+    results = sample_questions(_CATEGORY_QUESTIONS, count, {'category_id': category_id})
+    random.shuffle(results)
 
-    if not questions:
+    if not results:
+        # Only distinguish a missing category from an empty one on the miss path
+        if not db.session.get(Category, category_id):
+            return jsonify({"error": "Category not found"}), 404
         return jsonify({"error": "No questions found in this category"}), 404
 
     # Construct response with camelCase keys (no change needed as keys were simple)
@@ -64,8 +98,8 @@ def get_category_questions(category_id):
             'id': q.id,
             'question': q.question,
             'answer': q.answer,
-            'category': category.name, # Use the fetched category name
+            'category': category_name, # Use the joined category name
             'difficulty': q.difficulty
-        } for q in questions
+        } for q, category_name in results
     ]
     return jsonify(questions_data)
@@ -1,45 +1,91 @@
 from flask import Blueprint, request, jsonify
-from sqlalchemy import select, func
-from sqlalchemy.orm import selectinload
+from sqlalchemy import select, insert, update, bindparam, cast, Text
 from ...models import Event, Round
 from ...database import db
 from ...utils.auth import require_auth
+from ...utils.projections import json_object, json_array, questions_json
 from ... import app
-from datetime import datetime, timezone
+from datetime import timezone
+import ciso8601
 
 event_bp = Blueprint('event', __name__)
 
+# Fixed-shape queries are built once at import and executed with bind parameters
+# Read routes have PostgreSQL build the response JSON and return it as text,
+# so no ORM objects or dicts are created on the way out
+_MY_EVENT_JSON = json_object(
+    Event.id,
+    Event.name,
+    Event.event_date.label('eventDate'), # Renamed event_date
+    Event.created_at.label('createdAt'), # Renamed created_at
+    Event.status,
+    # We might need roundsCount here if ListEvent expects it based on the TS type
+)
+_MY_EVENTS = (
+    select(cast(json_array(_MY_EVENT_JSON, Event.created_at.desc()), Text))  # Most recent first
+    .where(Event.user_id == bindparam('user_id'))
+    .where(Event.is_deleted == False)  # Only return non-deleted events
+)
+_MY_EVENTS_BY_STATUS = _MY_EVENTS.where(Event.status == bindparam('status'))
+
+# Response shape for create_or_update_event, fetched via RETURNING
+_EVENT_RESPONSE = (
+    Event.id,
+    Event.name,
+    Event.event_date.label('eventDate'), # Renamed event_date
+    Event.created_at.label('createdAt'), # Renamed created_at
+    Event.status,
+    Event.description,
+    Event.user_id.label('userId'),
+)
+
+# One query: event -> non-deleted rounds -> questions, nested into a JSON document
+_ROUNDS_JSON = (
+    select(json_array(
+        json_object(
+            Round.id,
+            Round.round_number.label('roundNumber'),
+            Round.name,
+            Round.created_at.label('createdAt'),
+            Round.category_id.label('categoryId'),
+            questions_json(Round.id).label('questions'),
+        ),
+        Round.round_number,
+    ))
+    .where(Event.active_rounds.expression)  # Only non-deleted rounds
+    .scalar_subquery()
+)
+_EVENT_JSON = (
+    select(
+        Event.user_id,
+        cast(json_object(
+            Event.id,
+            Event.name,
+            Event.event_date.label('eventDate'),
+            Event.status,
+            Event.description,
+            _ROUNDS_JSON.label('rounds'),
+            Event.created_at.label('createdAt'),
+            Event.user_id.label('userId'),
+        ), Text),
+    )
+    .where(Event.id == bindparam('event_id'))
+)
+
 @event_bp.route('/events/my', methods=['GET'])
 @require_auth
 def get_my_events():
     """Fetch all non-deleted events created by the authenticated user."""
     try:
-        # Build the query with optional filters
-        stmt = (
-            select(Event)
-            .filter_by(user_id=request.user.id)
-            .filter_by(is_deleted=False)  # Only return non-deleted events
-            .order_by(Event.created_at.desc())  # Most recent first
-        )
-        
         # Add status filter if provided
         status = request.args.get('status')
         if status:
-            stmt = stmt.filter_by(status=status)
-            
-        events = db.session.scalars(stmt).all()
+            body = db.session.scalar(_MY_EVENTS_BY_STATUS, {'user_id': request.user.id, 'status': status})
+        else:
+            body = db.session.scalar(_MY_EVENTS, {'user_id': request.user.id})
         
-        # Manually create dicts with camelCase keys
-        events_data = [{
-            'id': event.id,
-            'name': event.name,
-            'eventDate': event.event_date.isoformat() if event.event_date else None, # Renamed event_date
-            'createdAt': event.created_at.isoformat(), # Renamed created_at
-            'status': event.status,
-            # We might need roundsCount here if ListEvent expects it based on the TS type
-            # 'roundsCount': len(event.rounds) # Example if needed - requires loading rounds
-        } for event in events]
-        return jsonify(events_data) # Return the transformed data
+        # Already a camelCase JSON array
+        return app.response_class(body, mimetype='application/json')
         
     except Exception as e:
         app.logger.error(f"Error fetching user events: {e}")
@@ -82,7 +128,7 @@ def create_or_update_event():
                  event_data['event_date'] = None
             else:
                 try:
-                    parsed_date = datetime.fromisoformat(event_date_str)
+                    parsed_date = ciso8601.parse_datetime(event_date_str)  # C parser, accepts the same ISO 8601 forms
                     if parsed_date.tzinfo is None:
                         # Assume UTC if no timezone is provided
                         parsed_date = parsed_date.replace(tzinfo=timezone.utc)
@@ -90,17 +136,28 @@ def create_or_update_event():
                 except (ValueError, TypeError): # Catch TypeError for None
                     return jsonify({'error': 'Invalid event_date format. Use ISO format (YYYY-MM-DDTHH:MM:SS[+-]HH:MM) or null'}), 400
 
-        # Get or create pattern
+        # Write and read back in one statement; RETURNING hands us the
+        # server-side defaults (created_at etc.) without a refresh
         if event_id:
-            event = db.session.get(Event, event_id)
-            if not event:
-                 return jsonify({'error': 'Event not found'}), 404
-            # Check permissions only when updating an existing event
-            if event.user_id != request.user.id:
+            # Ownership is part of the WHERE clause, so a miss means the event
+            # is either missing or someone else's
+            stmt = (
+                update(Event)
+                .where(Event.id == event_id, Event.user_id == request.user.id)
+                .returning(*_EVENT_RESPONSE)
+            )
+            if event_data:
+                stmt = stmt.values(**event_data)
+            else:
+                # Nothing to change; keep the same single-statement shape
+                stmt = stmt.values(id=Event.id)
+            event = db.session.execute(stmt).mappings().first()
+            if event is None:
+                db.session.rollback()
+                owner_id = db.session.scalar(select(Event.user_id).where(Event.id == event_id))
+                if owner_id is None:
+                    return jsonify({'error': 'Event not found'}), 404
                 return jsonify({'error': 'Permission denied'}), 403
-            # Apply updates from the filtered dictionary
-            for key, value in event_data.items():
-                setattr(event, key, value)
         else:
             # Create new event
             # Ensure required fields are present
@@ -114,23 +171,14 @@ def create_or_update_event():
             # Add user_id explicitly for creation
             event_data['user_id'] = request.user.id
 
-            event = Event(**event_data) # Create using the prepared dict
-            db.session.add(event)
-
+            event = db.session.execute(
+                insert(Event).values(**event_data).returning(*_EVENT_RESPONSE)
+            ).mappings().first()
 
         db.session.commit()
-        db.session.refresh(event) # Ensure computed fields like created_at are loaded
-
-        # Construct response with camelCase keys
-        return jsonify({
-            'id': event.id,
-            'name': event.name,
-            'eventDate': event.event_date.isoformat() if event.event_date else None, # Renamed event_date
-            'createdAt': event.created_at.isoformat(), # Renamed created_at
-            'status': event.status,
-            'description': event.description,
-            'userId': event.user_id # Add userId
-        }), 200 if event_id else 201
+
+        # Columns are already labelled with the camelCase response keys
+        return jsonify(event), 200 if event_id else 201
 
     except Exception as e:
         db.session.rollback()
@@ -141,61 +189,17 @@ def create_or_update_event():
 @require_auth
 def get_event(event_id):
     """Fetch an event and its associated rounds by event ID."""
-    stmt = (
-        select(Event)
-        .options(
-            selectinload(Event.rounds.and_(Round.is_deleted == False))  # Only load non-deleted rounds
-            .selectinload(Round.normalized_questions)
-        )
-        .filter_by(id=event_id)
-    )
-    event = db.session.scalar(stmt)
-
-
-    if not event:
+    row = db.session.execute(_EVENT_JSON, {'event_id': event_id}).first()
+    if row is None:
         return jsonify({'error': 'Event not found'}), 404
+    owner_id, body = row
     
     # Check permission AFTER fetching, to give correct 404 vs 403
-    if event.user_id != request.user.id:
+    if owner_id != request.user.id:
         return jsonify({'error': 'Permission denied'}), 403
 
-
-    # Structure the response with camelCase keys
-    rounds_data = [
-        {
-            'id': r.id,
-            'roundNumber': r.round_number,
-            'name': r.name,
-            'createdAt': r.created_at.isoformat() if r.created_at else None,
-            'categoryId': r.category_id,
-            'questions': [
-                {
-                    'roundQuestionId': q.round_question_id,
-                    'roundId': q.round_id,
-                    'questionNumber': q.question_number,
-                    'questionId': q.question_id,
-                    'questionType': q.question_type,
-                    'question': q.question,
-                    'answer': q.answer,
-                    'difficulty': q.difficulty,
-                    'categoryId': q.category_id,
-                    'categoryName': q.category_name
-                } for q in r.normalized_questions
-            ]
-        } for r in event.rounds
-    ]
-    
-    event_data = {
-        'id': event.id,
-        'name': event.name,
-        'eventDate': event.event_date.isoformat() if event.event_date else None,
-        'status': event.status,
-        'description': event.description,
-        'rounds': rounds_data,
-        'createdAt': event.created_at.isoformat() if event.created_at else None,
-        'userId': event.user_id,
-    }
-    return jsonify(event_data)
+    # Already the camelCase response document, rounds and questions included
+    return app.response_class(body, mimetype='application/json')
 
 
 @event_bp.route('/events/<int:event_id>', methods=['DELETE'])
@@ -1,34 +1,42 @@
 from flask import Blueprint, request, jsonify
-from sqlalchemy import select, func
+from sqlalchemy import select, insert, bindparam
 from sqlalchemy.orm import joinedload
 from ...utils.auth import require_auth
+from ...utils.sampling import sample_questions
 from ...models import TriviaQuestion, Category, User, UserGeneratedQuestion
 from ...database import db  
 from ... import app
 
 question_bp = Blueprint('question', __name__)
 
+# Fixed-shape queries are built once at import and executed with bind parameters,
+# one per combination of filters: (difficulty given, category given)
+_RANDOM_QUESTION = select(TriviaQuestion).options(joinedload(TriviaQuestion.category)) # Eager load category
+_RANDOM_QUESTION_BY_FILTERS = {
+    (False, False): _RANDOM_QUESTION,
+    (True, False): _RANDOM_QUESTION.where(TriviaQuestion.difficulty == bindparam('difficulty')),
+    (False, True): _RANDOM_QUESTION.where(TriviaQuestion.category_id == bindparam('category_id')),
+    (True, True): _RANDOM_QUESTION.where(
+        TriviaQuestion.category_id == bindparam('category_id'),
+        TriviaQuestion.difficulty == bindparam('difficulty'),
+    ),
+}
+
 @question_bp.route('/question', methods=['GET'])
 def get_question():
     """Get a random trivia question, optionally filtered."""
     difficulty = request.args.get('difficulty')
     category_id = request.args.get('category_id', type=int)
 
-    # Base query
-    stmt = select(TriviaQuestion).options(joinedload(TriviaQuestion.category)) # Eager load category
-
-    # Apply filters
-    if difficulty:
-        stmt = stmt.filter(TriviaQuestion.difficulty == difficulty)
-    if category_id:
-        stmt = stmt.filter(TriviaQuestion.category_id == category_id)
+    # Pick the prebuilt query for the filters given
+    stmt = _RANDOM_QUESTION_BY_FILTERS[(bool(difficulty), bool(category_id))]
 
-    # Order randomly and fetch one
-    stmt = stmt.order_by(func.random()).limit(1)
-    q = db.session.scalar(stmt)
+    # Pick one at random via the indexed rand_key rather than ORDER BY random()
+    rows = sample_questions(stmt, 1, {'difficulty': difficulty, 'category_id': category_id})
 
-    if not q:
+    if not rows:
         return jsonify({"error": "No questions found with these criteria"}), 404
+    q = rows[0][0]
 
     # Construct response with camelCase keys
     return jsonify({
@@ -41,52 +49,102 @@ def get_question():
     })
 
 
+_DIFFICULTIES = frozenset(('easy', 'medium', 'hard'))
+_MAX_QUESTIONS_PER_REQUEST = 500
+
+def _user_question_row(data):
+    """Validate one submitted question, returning (row, None) or (None, error message)."""
+    if not isinstance(data, dict):
+        return None, 'Each question must be an object'
+
+    question = data.get('question')
+    answer = data.get('answer')
+    difficulty = data.get('difficulty')
+
+    # Basic Validation
+    if not all([question, answer, difficulty]):
+        return None, 'Missing required fields: question, answer, difficulty'
+    if not isinstance(question, str) or not isinstance(answer, str):
+        return None, 'Invalid question or answer. Must be strings'
+    if not isinstance(difficulty, str) or difficulty not in _DIFFICULTIES:
+        return None, 'Invalid difficulty. Must be one of: easy, medium, hard'
+    if data.get('notes') is not None and not isinstance(data['notes'], str):
+        return None, 'Invalid notes. Must be a string'
+    # Ids go into sets for the existence checks below, so reject anything that isn't an integer
+    for field in ('category_id', 'created_by'):
+        value = data.get(field)
+        if value is not None and (not isinstance(value, int) or isinstance(value, bool)):
+            return None, f'Invalid {field}. Must be an integer'
+
+    return {
+        'question': question,
+        'answer': answer,
+        'category_id': data.get('category_id'), # Optional category
+        'difficulty': difficulty,
+        'created_by': data.get('created_by'), # Assuming you pass the user ID
+        'notes': data.get('notes'),
+        # status defaults to 'active'
+    }, None
+
+def _item_error(message, index, is_batch):
+    """400 response for one submitted question, naming its 1-based position in a batch."""
+    if is_batch:
+        message = f'Question {index + 1}: {message}'
+    return jsonify({'error': message}), 400
+
+def _first_missing_id(model, ids):
+    """Smallest of `ids` with no matching `model` row, checked in one query."""
+    if not ids:
+        return None
+    found = set(db.session.scalars(select(model.id).where(model.id.in_(ids))))
+    missing = ids - found
+    return min(missing) if missing else None
+
 @question_bp.route('/questions/user-generated', methods=['POST'])
 @require_auth
 def add_user_generated_question():
-    """Add a new user-generated question."""
+    """Add one user-generated question, or a list of them in a single insert."""
     data = request.get_json()
     if not data:
         return jsonify({'error': 'No input data provided'}), 400
 
-    question = data.get('question')
-    answer = data.get('answer')
-    category_id = data.get('category_id') # Optional category
-    difficulty = data.get('difficulty')
-    created_by = data.get('created_by') # Assuming you pass the user ID
-    notes = data.get('notes')
+    is_batch = isinstance(data, list)
+    items = data if is_batch else [data]
+    if len(items) > _MAX_QUESTIONS_PER_REQUEST:
+        return jsonify({'error': f'At most {_MAX_QUESTIONS_PER_REQUEST} questions per request'}), 400
 
-    # Basic Validation
-    if not all([question, answer, difficulty]):
-        return jsonify({'error': 'Missing required fields: question, answer, difficulty'}), 400
-    if difficulty not in ['easy', 'medium', 'hard']:
-        return jsonify({'error': 'Invalid difficulty. Must be one of: easy, medium, hard'}), 400
+    rows = []
+    for index, item in enumerate(items):
+        row, error = _user_question_row(item)
+        if error:
+            return _item_error(error, index, is_batch)
+        rows.append(row)
 
     # Optional: Validate category_id exists if provided
-    if category_id and not db.session.get(Category, category_id):
-         return jsonify({'error': f'Category with id {category_id} not found'}), 400
+    missing = _first_missing_id(Category, {r['category_id'] for r in rows if r['category_id']})
+    if missing is not None:
+        index = next(i for i, r in enumerate(rows) if r['category_id'] == missing)
+        return _item_error(f'Category with id {missing} not found', index, is_batch)
 
     # Optional: Validate created_by exists if provided (or get from session)
     # If using auth, you'd likely get this from the token instead of the payload
-    if created_by and not db.session.get(User, created_by):
-         return jsonify({'error': f'User with id {created_by} not found'}), 400
-
-    new_q = UserGeneratedQuestion(
-        question=question,
-        answer=answer,
-        category_id=category_id,
-        difficulty=difficulty,
-        created_by=created_by,
-        notes=notes
-        # status defaults to 'active'
-    )
+    missing = _first_missing_id(User, {r['created_by'] for r in rows if r['created_by']})
+    if missing is not None:
+        index = next(i for i, r in enumerate(rows) if r['created_by'] == missing)
+        return _item_error(f'User with id {missing} not found', index, is_batch)
 
     try:
-        db.session.add(new_q)
+        # One multi-row INSERT ... RETURNING id, ids in the order submitted
+        ids = db.session.scalars(
+            insert(UserGeneratedQuestion).returning(UserGeneratedQuestion.id, sort_by_parameter_order=True),
+            rows
+        ).all()
         db.session.commit()
-        return jsonify({'id': new_q.id, 'message': 'Question added successfully'}), 201
+        if is_batch:
+            return jsonify({'ids': ids, 'message': f'{len(ids)} questions added successfully'}), 201
+        return jsonify({'id': ids[0], 'message': 'Question added successfully'}), 201
     except Exception as e:
         db.session.rollback()
         app.logger.error(f"Error adding user question: {e}")
         # Provide a more specific error if possible (e.g., FK violation)
-        return jsonify({'error': f'Could not add question: {e}'}), 500
\ No newline at end of file
+        return jsonify({'error': f'Could not add question: {e}'}), 500
@@ -1,125 +1,79 @@
 from flask import Blueprint, request, jsonify
-from sqlalchemy import select, func
-from sqlalchemy.orm import selectinload
+from sqlalchemy import select, func, bindparam, cast, Text
 from ...models import Round, Event
 from ...database import db
 from ...utils.auth import require_auth
+from ...utils.projections import json_object, questions_json
 from ... import app
 
 round_bp = Blueprint('round', __name__)
 
+# Fixed-shape queries are built once at import and executed with bind parameters
+# Round + owning user in one lookup; outer join so an orphaned round is reported, not hidden.
+# PostgreSQL builds the response JSON, which is returned to the client as is
+_ROUND_JSON = (
+    select(
+        Event.user_id,
+        cast(json_object(
+            Round.id,
+            Round.name,
+            Round.round_number.label('roundNumber'),
+            Round.event_id.label('eventId'),
+            Round.category_id.label('categoryId'),
+            Round.created_at.label('createdAt'),
+            questions_json(Round.id).label('questions'),
+        ), Text),
+    )
+    .select_from(Round)
+    .outerjoin(Event, Event.id == Round.event_id)
+    .where(Round.id == bindparam('round_id'))
+)
+_ROUND_QUESTIONS_JSON = (
+    select(Event.user_id, cast(questions_json(Round.id), Text))
+    .select_from(Round)
+    .outerjoin(Event, Event.id == Round.event_id)
+    .where(Round.id == bindparam('round_id'))
+)
+_OWNED_EVENT = select(Event).where(Event.id == bindparam('event_id'), Event.user_id == bindparam('user_id'))
+
 @round_bp.route('/rounds/<int:round_id>', methods=['GET'])
 @require_auth
 def get_round(round_id):
     """Fetch a specific round and all its questions."""
-    # Check if the round exists
-    round_exists = db.session.get(Round, round_id)
-    if not round_exists:
+    # Load the round, its owner and its normalized questions together
+    row = db.session.execute(_ROUND_JSON, {'round_id': round_id}).first()
+    if row is None:
         return jsonify({'error': f'Round with id {round_id} not found'}), 404
+    event_owner_id, body = row
 
     # Verify user has access to the event
-    event_owner_id = db.session.scalar(select(Event.user_id).join(Round).filter(Round.id == round_id))
     if event_owner_id is None:
         return jsonify({'error': 'Round data inconsistent'}), 500
     if event_owner_id != request.user.id:
         return jsonify({'error': 'Permission denied to access this round'}), 403
 
-    try:
-        # Select the Round and eager load the normalized questions
-        stmt = (
-            select(Round)
-            .where(Round.id == round_id)
-            .options(
-                selectinload(Round.normalized_questions)
-            )
-        )
-        round_obj = db.session.scalars(stmt).first()
-
-        if not round_obj:
-            return jsonify({'error': f'Round with id {round_id} not found'}), 404
-
-        # Construct questions list
-        questions_list = [{
-            'roundQuestionId': q.round_question_id,
-            'roundId': q.round_id,
-            'questionNumber': q.question_number,
-            'questionId': q.question_id,
-            'questionType': q.question_type,
-            'question': q.question,
-            'answer': q.answer,
-            'difficulty': q.difficulty,
-            'categoryId': q.category_id,
-            'categoryName': q.category_name
-        } for q in round_obj.normalized_questions]
-
-        # Construct round response
-        round_response = {
-            'id': round_obj.id,
-            'name': round_obj.name,
-            'roundNumber': round_obj.round_number,
-            'eventId': round_obj.event_id,
-            'categoryId': round_obj.category_id,
-            'createdAt': round_obj.created_at.isoformat() if round_obj.created_at else None,
-            'questions': questions_list
-        }
-
-        return jsonify(round_response)
-    except Exception as e:
-        app.logger.error(f"Error fetching round {round_id}: {e}")
-        return jsonify({'error': 'Failed to retrieve round data'}), 500
+    # Already the camelCase response document, questions included
+    return app.response_class(body, mimetype='application/json')
 
 @round_bp.route('/rounds/<int:round_id>/questions', methods=['GET'])
 @require_auth
 def get_round_questions(round_id):
     """Fetch all questions for a specific round using the normalized view."""
 
-    # Optional but recommended: Check if the round itself exists first
-    round_exists = db.session.get(Round, round_id)
-    if not round_exists:
+    # Check the round exists, look up its owner and build the questions JSON in one query
+    row = db.session.execute(_ROUND_QUESTIONS_JSON, {'round_id': round_id}).first()
+    if row is None:
          return jsonify({'error': f'Round with id {round_id} not found'}), 404
+    event_owner_id, body = row
 
     # Verify the user has access to the event this round belongs to
-    event_owner_id = db.session.scalar(select(Event.user_id).join(Round).filter(Round.id == round_id))
     if event_owner_id is None: # Should not happen if round exists, but safety check
         return jsonify({'error': 'Round data inconsistent'}), 500
     if event_owner_id != request.user.id:
         return jsonify({'error': 'Permission denied to access this round\'s questions'}), 403
 
-    try:
-        # Select the Round and eager load the normalized questions from the view
-        stmt = (
-            select(Round)
-            .where(Round.id == round_id)
-            .options(
-                selectinload(Round.normalized_questions) # Eager load the view relationship
-            )
-        )
-        round_obj = db.session.scalars(stmt).first()
-
-        # Double check if round_obj was actually found
-        if not round_obj:
-            # This case should ideally be caught by the initial get, but good safety check
-            return jsonify({'error': f'Round with id {round_id} not found after loading relationships'}), 404
-
-        # Construct response with camelCase keys from the normalized view data
-        questions_list = [{
-            'roundQuestionId': q.round_question_id, 
-            'roundId': q.round_id,                
-            'questionNumber': q.question_number,  
-            'questionId': q.question_id,           
-            'questionType': q.question_type,       
-            'question': q.question,
-            'answer': q.answer,
-            'difficulty': q.difficulty,
-            'categoryId': q.category_id,           
-            'categoryName': q.category_name        
-        } for q in round_obj.normalized_questions] 
-
-        return jsonify(questions_list)
-    except Exception as e:
-        # Log the error for debugging
-        app.logger.error(f"Database error fetching questions for round {round_id}: {e}")
-        return jsonify({'error': 'Failed to retrieve questions due to a database error'}), 500
+    # Already a camelCase JSON array
+    return app.response_class(body, mimetype='application/json')
 
 @round_bp.route('/rounds', methods=['POST'])
 @require_auth
@@ -132,9 +86,7 @@ def create_round():
     event_id = data['event_id']
 
     # Verify the event exists and belongs to the current user
-    event = db.session.scalar(
-        select(Event).filter_by(id=event_id, user_id=request.user.id)
-    )
+    event = db.session.scalar(_OWNED_EVENT, {'event_id': event_id, 'user_id': request.user.id})
     if not event:
         # Check if the event exists at all to give a more specific error
         event_exists = db.session.get(Event, event_id)
@@ -144,23 +96,23 @@ def create_round():
              return jsonify({'error': 'Permission denied to add rounds to this event'}), 403
 
     try:
-        # Find the highest current round number for this event
-        max_round_number = db.session.scalar(
-            select(func.max(Round.round_number))
-            .filter_by(event_id=event_id)
+        # Next round number for this event, computed inside the INSERT itself
+        new_round_number = (
+            select(func.coalesce(func.max(Round.round_number), 0) + 1)
+            .where(Round.event_id == event_id)
+            .scalar_subquery()
         )
-        new_round_number = (max_round_number or 0) + 1
 
         # Create the new round
         new_round = Round(
             event_id=event_id,
             round_number=new_round_number,
-            name=f"Round {new_round_number}" # Default name
+            name=func.concat('Round ', new_round_number) # Default name
             # category_id will be null by default
         )
 
         db.session.add(new_round)
-        db.session.commit()
+        db.session.commit() # round_number/name are reloaded from the row on access
 
         # Construct response with camelCase keys
         return jsonify({
@@ -170,7 +122,7 @@ def create_round():
             'eventId': new_round.event_id,
             'categoryId': new_round.category_id,
             'questions': [], # makes UI code cleaner
-            'createdAt': new_round.created_at.isoformat() if new_round.created_at else None # Add createdAt
+            'createdAt': new_round.created_at # Add createdAt
         }), 201
 
     except Exception as e:
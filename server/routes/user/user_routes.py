@@ -2,13 +2,54 @@ import secrets
 from ... import app
 from ...database import db
 from ...models import User, UserSession
-from ...utils.auth import require_auth
-from sqlalchemy import select
-from datetime import datetime, timezone, timedelta
+from ...utils.auth import require_auth, forget_session_token
+from sqlalchemy import select, insert, update, delete, bindparam, func
+from datetime import timedelta
 from flask import request, jsonify, Blueprint
 
 user_bp = Blueprint('user', __name__)
 
+# Fixed-shape queries are built once at import and executed with bind parameters
+_USER_BY_EMAIL = select(User).where(User.email == bindparam('email'))
+_SESSION_BY_TOKEN = select(UserSession).where(UserSession.session_token == bindparam('session_token'))
+
+# Sessions expire a week after creation; timestamps are taken from the database clock
+SESSION_LIFETIME = timedelta(days=7)
+
+# Opening a session is one statement: insert the session, stamp the user's
+# last_login and purge their expired sessions (which nothing else deletes) in
+# data-modifying CTEs, returning the new last_login
+_LAST_LOGIN = (
+    update(User)
+    .where(User.id == bindparam('user_id'))
+    .values(last_login=func.now())
+    .returning(User.last_login)
+    .cte('last_login')
+)
+_PURGE_EXPIRED_SESSIONS = (
+    delete(UserSession.__table__)
+    .where(UserSession.user_id == bindparam('user_id'))
+    .where(UserSession.expires_at <= func.now())
+    .cte('purged_sessions')
+)
+_START_SESSION = (
+    insert(UserSession.__table__)  # Core insert: the ORM would drop the non-entity RETURNING
+    .values(
+        user_id=bindparam('user_id'),
+        session_token=bindparam('session_token'),
+        expires_at=func.now() + SESSION_LIFETIME,
+    )
+    .add_cte(_LAST_LOGIN, _PURGE_EXPIRED_SESSIONS)
+    .returning(select(_LAST_LOGIN.c.last_login).scalar_subquery())
+)
+
+def _start_session(user_id):
+    """Create a session for the user, update last_login and drop their expired
+    sessions; returns (token, last_login)."""
+    session_token = secrets.token_urlsafe(32)
+    last_login = db.session.scalar(_START_SESSION, {'user_id': user_id, 'session_token': session_token})
+    return session_token, last_login
+
 @user_bp.route('/auth/register', methods=['POST'])
 def register():
     """Register a new user."""
@@ -33,20 +74,16 @@ def register():
 
     try:
         db.session.add(new_user)
-        db.session.commit()
-        # Generate session token after user creation
-        session_token = secrets.token_urlsafe(32)
-        expires_at = datetime.now(timezone.utc) + timedelta(days=7)
-        new_session = UserSession(user_id=new_user.id, session_token=session_token, expires_at=expires_at)
-        new_user.last_login = datetime.now(timezone.utc)
-        db.session.add(new_session)
+        db.session.flush() # Assigns new_user.id without ending the transaction
+        # Open the first session after user creation
+        session_token, last_login = _start_session(new_user.id)
         db.session.commit()
         user_data = {
             'id': new_user.id,
             'username': new_user.username,
             'email': new_user.email,
-            'createdAt': new_user.created_at.isoformat() if hasattr(new_user, 'created_at') and new_user.created_at else None,
-            'lastLogin': new_user.last_login.isoformat() if new_user.last_login else None
+            'createdAt': new_user.created_at,
+            'lastLogin': last_login
         }
         return jsonify({
             'message': 'User registered successfully',
@@ -69,31 +106,22 @@ def login():
     email = data['email']
     password = data['password']
 
-    user = db.session.scalar(select(User).filter_by(email=email))
+    user = db.session.scalar(_USER_BY_EMAIL, {'email': email})
 
     if not user or not user.check_password(password):
         return jsonify({'error': 'Invalid credentials'}), 401
 
-    # Generate session token
-    session_token = secrets.token_urlsafe(32)
-    expires_at = datetime.now(timezone.utc) + timedelta(days=7) # Use timezone-aware
-
-    # Create session
-    new_session = UserSession(user_id=user.id, session_token=session_token, expires_at=expires_at)
-
-    # Update last login
-    user.last_login = datetime.now(timezone.utc) # Use timezone-aware
-
     try:
-        db.session.add(new_session)
+        # Create the session (expiry computed server-side) and update last login together
+        session_token, last_login = _start_session(user.id)
         db.session.commit()
         # Construct user data with camelCase keys
         user_data = {
             'id': user.id,
             'username': user.username,
             'email': user.email,
-            'createdAt': user.created_at.isoformat() if hasattr(user, 'created_at') and user.created_at else None,
-            'lastLogin': user.last_login.isoformat() if user.last_login else None
+            'createdAt': user.created_at,
+            'lastLogin': last_login
         }
         return jsonify({
             'sessionToken': session_token,
@@ -109,13 +137,11 @@ def login():
 @require_auth
 def logout():
     """Logout a user by invalidating their session."""
-    auth_header = request.headers.get('Authorization')
-    if not auth_header or not auth_header.startswith('Bearer '):
-        return jsonify({'error': 'Missing or invalid authorization header'}), 401
-
-    session_token = auth_header.split(' ')[1]
+    # Already parsed from the Authorization header by authenticate_request
+    session_token = request.session_token
+    forget_session_token(session_token)
 
-    session_to_delete = db.session.scalar(select(UserSession).filter_by(session_token=session_token))
+    session_to_delete = db.session.scalar(_SESSION_BY_TOKEN, {'session_token': session_token})
 
     if session_to_delete:
         try:
@@ -144,6 +170,6 @@ def get_current_user():
         'id': user.id,
         'username': user.username,
         'email': user.email,
-        'createdAt': user.created_at.isoformat() if user.created_at else None,
-        'lastLogin': user.last_login.isoformat() if user.last_login else None
+        'createdAt': user.created_at,
+        'lastLogin': user.last_login
     })
\ No newline at end of file
@@ -1,39 +1,99 @@
+import hashlib
 from datetime import datetime, timezone
-from functools import wraps
-from flask import jsonify, request
-from sqlalchemy import select
+from threading import Lock
+from cachetools import TTLCache
+from flask import current_app, jsonify, request
+from sqlalchemy import select, bindparam
 from sqlalchemy.orm import joinedload
 from typing import Optional
 
 from ..models.user import User, UserSession
 from ..database import db
 
+# Built once at import; runs on every authenticated request
+_ACTIVE_SESSION = (
+    select(UserSession)
+    .options(joinedload(UserSession.user))
+    .where(UserSession.session_token == bindparam('session_token'))
+    .where(UserSession.expires_at > bindparam('now'))
+)
+
+# sha256(token) -> (user_id, expires_at) for recently seen sessions, so repeat
+# requests skip the token lookup. Entries live at most 60s, which bounds how long
+# a session deleted by another process can keep working here.
+_session_cache = TTLCache(maxsize=10_000, ttl=60)
+_session_cache_lock = Lock()
+
+def _token_key(session_token: str) -> bytes:
+    return hashlib.sha256(session_token.encode('utf-8')).digest()
+
+def forget_session_token(session_token: str) -> None:
+    """Drop a session token from this process's cache (e.g. on logout)."""
+    with _session_cache_lock:
+        _session_cache.pop(_token_key(session_token), None)
+
 def get_user_from_token(session_token: str) -> Optional[User]:
     """Fetches a user based on a valid session token."""
     if not session_token:
         return None
+    now = datetime.now(timezone.utc)
+    key = _token_key(session_token)
+    with _session_cache_lock:
+        cached = _session_cache.get(key)
+
+    if cached is not None:
+        user_id, expires_at = cached
+        if expires_at > now:
+            return db.session.get(User, user_id)
+        forget_session_token(session_token)
+        return None
+
     session = db.session.scalar(
-        select(UserSession)
-        .options(joinedload(UserSession.user))
-        .filter_by(session_token=session_token)
-        .filter(UserSession.expires_at > datetime.now(timezone.utc))
+        _ACTIVE_SESSION,
+        {'session_token': session_token, 'now': now}
     )
-    return session.user if session else None
+    if not session:
+        return None
+    with _session_cache_lock:
+        _session_cache[key] = (session.user_id, session.expires_at)
+    return session.user
+
+_BEARER_PREFIX = 'Bearer '
+
+def bearer_token(auth_header: Optional[str]) -> Optional[str]:
+    """Extract the token from an 'Authorization: Bearer <token>' header value."""
+    if not auth_header or not auth_header.startswith(_BEARER_PREFIX):
+        return None
+    return auth_header[len(_BEARER_PREFIX):]
 
 def require_auth(f):
-    @wraps(f)
-    def decorated(*args, **kwargs):
-        auth_header = request.headers.get('Authorization')
-        if not auth_header or not auth_header.startswith('Bearer '):
-            return jsonify({'error': 'Missing or invalid authorization header'}), 401
-
-        session_token = auth_header.split(' ')[1]
-        user = get_user_from_token(session_token)
+    """Mark a view as requiring a valid session; enforced by authenticate_request."""
+    f.requires_auth = True
+    return f
+
+def authenticate_request():
+    """before_request hook that authenticates views marked with @require_auth."""
+    # Let CORS preflights and unmarked (public) views through untouched
+    if request.method == 'OPTIONS':
+        return None
+    view = current_app.view_functions.get(request.endpoint)
+    if not getattr(view, 'requires_auth', False):
+        return None
+
+    session_token = bearer_token(request.headers.get('Authorization'))
+    if session_token is None:
+        return jsonify({'error': 'Missing or invalid authorization header'}), 401
+
+    user = get_user_from_token(session_token)
+    
+    if not user:
+        return jsonify({'error': 'Invalid or expired session'}), 401
         
-        if not user:
-            return jsonify({'error': 'Invalid or expired session'}), 401
-            
-        # Add the user to the request context
-        request.user = user
-        return f(*args, **kwargs)
-    return decorated 
\ No newline at end of file
+    # Add the user (and the token it was found by) to the request context
+    request.user = user
+    request.session_token = session_token
+    return None
+
+def init_auth(app):
+    """Register request authentication"""
+    app.before_request(authenticate_request) 
\ No newline at end of file
@@ -0,0 +1,30 @@
+import decimal
+from collections.abc import Mapping
+import orjson
+from flask.json.provider import JSONProvider
+
+def _default(obj):
+    """Serialize types orjson doesn't handle natively."""
+    if isinstance(obj, decimal.Decimal):
+        return str(obj)
+    if isinstance(obj, Mapping):  # e.g. SQLAlchemy RowMapping from .mappings()
+        return dict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+class OrjsonProvider(JSONProvider):
+    """JSON provider backed by orjson.
+
+    datetime/date values are emitted as ISO 8601 strings (the same output as
+    .isoformat()), so routes can pass them through without converting.
+    """
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=_default).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        # Skip the bytes -> str -> bytes round trip dumps() would force
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(orjson.dumps(obj, default=_default), mimetype='application/json')
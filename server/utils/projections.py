@@ -0,0 +1,41 @@
+from sqlalchemy import select, func, literal_column
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+
+from ..models import NormalizedQuestion
+
+# Columns of the normalized questions view, labelled with the camelCase keys
+# the API returns so rows can be serialized without building dicts by hand
+QUESTION_COLUMNS = (
+    NormalizedQuestion.round_question_id.label('roundQuestionId'),
+    NormalizedQuestion.round_id.label('roundId'),
+    NormalizedQuestion.question_number.label('questionNumber'),
+    NormalizedQuestion.question_id.label('questionId'),
+    NormalizedQuestion.question_type.label('questionType'),
+    NormalizedQuestion.question.label('question'),
+    NormalizedQuestion.answer.label('answer'),
+    NormalizedQuestion.difficulty.label('difficulty'),
+    NormalizedQuestion.category_id.label('categoryId'),
+    NormalizedQuestion.category_name.label('categoryName'),
+)
+
+EMPTY_JSON_ARRAY = literal_column("'[]'::json")
+
+def json_object(*columns):
+    """json_build_object() over the given columns, keyed by each column's label."""
+    args = []
+    for column in columns:
+        # Keys are fixed identifiers, so inline them rather than binding
+        args += (literal_column(f"'{column.key}'"), column)
+    return func.json_build_object(*args)
+
+def json_array(obj, *order_by):
+    """json_agg() of `obj` in the given order, '[]' rather than NULL when empty."""
+    return func.coalesce(func.json_agg(aggregate_order_by(obj, *order_by)), EMPTY_JSON_ARRAY)
+
+def questions_json(round_id):
+    """Scalar subquery building the JSON array of a round's questions."""
+    return (
+        select(json_array(json_object(*QUESTION_COLUMNS), NormalizedQuestion.question_number))
+        .where(NormalizedQuestion.round_id == round_id)
+        .scalar_subquery()
+    )
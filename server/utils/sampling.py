@@ -0,0 +1,64 @@
+import random
+from functools import lru_cache
+
+from sqlalchemy import select, func, bindparam
+
+from ..models.question import TriviaQuestion
+from ..database import db
+
+@lru_cache(maxsize=32)
+def _sampling_statements(stmt):
+    """Probe, forward and wrap-around queries for a prebuilt select, built once per statement."""
+    rand_key = TriviaQuestion.rand_key
+    ids = stmt.with_only_columns(TriviaQuestion.id).order_by(rand_key).limit(1)
+
+    # One independent random pivot per probe row
+    probes = (
+        select(func.random().label('pivot'))
+        .select_from(func.generate_series(1, bindparam('probes')))
+        .subquery('probes')
+    )
+    # First row at or after each pivot, wrapping around to the lowest rand_key
+    pick = func.coalesce(
+        ids.where(rand_key >= probes.c.pivot).scalar_subquery(),
+        ids.scalar_subquery(),
+    )
+    picked = select(pick.label('id')).select_from(probes).distinct().subquery('picked')
+    # The random sort only covers the handful of distinct picks, not the table
+    chosen = select(picked.c.id).order_by(func.random()).limit(bindparam('count'))
+    probe = stmt.where(TriviaQuestion.id.in_(chosen))
+
+    # Top-up reads for rows lost to duplicate picks, skipping rows already sampled
+    rest = stmt.where(TriviaQuestion.id.not_in(bindparam('exclude', expanding=True)))
+    forward = rest.where(rand_key >= bindparam('pivot')).order_by(rand_key).limit(bindparam('count'))
+    wrap = rest.where(rand_key < bindparam('pivot')).order_by(rand_key).limit(bindparam('count'))
+    return probe, forward, wrap
+
+def sample_questions(stmt, count, params=None):
+    """Fetch min(count, matching rows) random rows from a TriviaQuestion select, in no particular order.
+
+    Instead of ORDER BY random() (which sorts every matching row), each of
+    2 * count probes jumps to its own random point on the indexed rand_key
+    column and takes the first row there, so rows are not returned alongside
+    the same neighbours every time. Duplicate picks are dropped and `count`
+    of the rest kept. If that leaves us short, the missing rows are read
+    forward from one more random point among the rows not yet picked,
+    wrapping around to the start if we run off the end, so at most three
+    queries are issued. A row's chance of being picked is proportional to
+    the rand_key gap below it; rand_key is uniform, so gaps are small and
+    even, but the pick is not exactly uniform.
+
+    `stmt` must select TriviaQuestion first and should be built once at
+    import (its filters given as bind parameters supplied through
+    `params`), since the queries derived from it are cached per statement.
+    """
+    probe, forward, wrap = _sampling_statements(stmt)
+    params = {**(params or {}), 'probes': 2 * count, 'count': count}
+    rows = db.session.execute(probe, params).all()
+    for top_up in (forward, wrap):
+        if len(rows) >= count:
+            break
+        params.setdefault('pivot', random.random())
+        params.update(count=count - len(rows), exclude=[row[0].id for row in rows])
+        rows += db.session.execute(top_up, params).all()
+    return rows
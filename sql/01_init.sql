@@ -20,7 +20,7 @@ CREATE TABLE IF NOT EXISTS user_sessions (
 );
 
 -- Create index for faster session lookups
-CREATE INDEX IF NOT EXISTS idx_user_sessions_token ON user_sessions(session_token);
+CREATE INDEX IF NOT EXISTS idx_user_sessions_token ON user_sessions USING hash (session_token);
 CREATE INDEX IF NOT EXISTS idx_user_sessions_user_id ON user_sessions(user_id);
 
 -- Create categories table for organizing questions
@@ -41,6 +41,7 @@ CREATE TABLE IF NOT EXISTS trivia_questions (
     original_round SMALLINT,            -- Original round for reference
     notes TEXT,
     old_category_id INTEGER,
+    rand_key DOUBLE PRECISION NOT NULL DEFAULT random(), -- Uniform [0, 1) sort key for random sampling
     FOREIGN KEY (category_id) REFERENCES categories(id)
 );
 
@@ -121,6 +122,11 @@ LEFT JOIN categories ugq_cat ON ugq.category_id = ugq_cat.id;
 -- Create helpful indexes
 CREATE INDEX IF NOT EXISTS idx_trivia_questions_difficulty ON trivia_questions(difficulty);
 CREATE INDEX IF NOT EXISTS idx_trivia_questions_category_id ON trivia_questions(category_id);
+CREATE INDEX IF NOT EXISTS idx_trivia_questions_rand_key ON trivia_questions(rand_key);
+CREATE INDEX IF NOT EXISTS idx_trivia_questions_difficulty_rand_key ON trivia_questions(difficulty, rand_key);
+CREATE INDEX IF NOT EXISTS idx_trivia_questions_category_rand_key ON trivia_questions(category_id, rand_key);
+CREATE INDEX IF NOT EXISTS idx_trivia_questions_category_difficulty_rand_key ON trivia_questions(category_id, difficulty, rand_key);
+CREATE INDEX IF NOT EXISTS idx_categories_lower_name ON categories(LOWER(name));
 CREATE INDEX IF NOT EXISTS idx_round_questions_preset_id ON round_questions(preset_question_id);
 CREATE INDEX IF NOT EXISTS idx_round_questions_user_id ON round_questions(user_question_id);
 CREATE INDEX IF NOT EXISTS idx_rounds_event_id ON rounds(event_id);
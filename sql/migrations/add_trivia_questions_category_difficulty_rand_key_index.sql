@@ -0,0 +1,4 @@
+-- Supports "WHERE category_id = ? AND difficulty = ? AND rand_key >= ? ORDER BY rand_key LIMIT 1",
+-- i.e. /question with both filters; CONCURRENTLY avoids blocking writes while it builds
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_trivia_questions_category_difficulty_rand_key
+ON trivia_questions(category_id, difficulty, rand_key);
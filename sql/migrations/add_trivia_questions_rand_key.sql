@@ -0,0 +1,7 @@
+-- Add a random sort key so random questions can be sampled with an index scan
+-- instead of ORDER BY random() over every matching row
+ALTER TABLE trivia_questions
+ADD COLUMN IF NOT EXISTS rand_key DOUBLE PRECISION NOT NULL DEFAULT random();
+
+-- Supports "WHERE category_id = ? AND rand_key >= ? ORDER BY rand_key LIMIT n"
+CREATE INDEX IF NOT EXISTS idx_trivia_questions_category_rand_key ON trivia_questions(category_id, rand_key);
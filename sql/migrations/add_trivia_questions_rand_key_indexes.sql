@@ -0,0 +1,4 @@
+-- Indexes for random sampling of questions with no filter or a difficulty filter
+-- (the category_id variant is created in add_trivia_questions_rand_key.sql)
+CREATE INDEX IF NOT EXISTS idx_trivia_questions_rand_key ON trivia_questions(rand_key);
+CREATE INDEX IF NOT EXISTS idx_trivia_questions_difficulty_rand_key ON trivia_questions(difficulty, rand_key);
@@ -0,0 +1,4 @@
+-- Session tokens are only ever looked up by equality, so a hash index is
+-- smaller and cheaper to probe than the B-tree it replaces
+DROP INDEX IF EXISTS idx_user_sessions_token;
+CREATE INDEX idx_user_sessions_token ON user_sessions USING hash (session_token);